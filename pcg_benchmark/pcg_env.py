@@ -189,10 +189,7 @@ class PCGEnv:
         else:
             infos = contents
         
-        sim_mat = np.zeros((len(infos), len(infos)))
-        for i1 in range(len(infos)):
-            for i2 in range(len(infos)):
-                sim_mat[i1][i2] = 1.0-self._problem.diversity(infos[i1], infos[i2])
+        sim_mat = 1.0 - np.asarray(self._problem.batch_diversity(infos))
 
         diversity = np.array(_recursiveDiversity(infos, sim_mat))
 
@@ -1,7 +1,8 @@
 from pcg_benchmark.probs import Problem
 from pcg_benchmark.spaces import ArraySpace, IntegerSpace, DictionarySpace
-from pcg_benchmark.probs.utils import get_longest_path_and_coords, get_range_reward, get_number_regions, get_longest_path
+from pcg_benchmark.probs.utils import get_regions_and_longest_path, get_range_reward, get_batch_hamming
 import numpy as np
+from numba import njit
 from PIL import Image
 from pprint import pprint
 import os
@@ -13,6 +14,24 @@ class Tile(IntEnum):
     EMPTY = 0
     WALL = 1
 
+_GRAPHICS = None
+
+def _load_graphics():
+    """
+    Decode the tile graphics into a stacked (n_tiles, 16, 16, 4) RGBA array.
+    The PNG files are opened and decoded exactly once per process.
+    """
+    global _GRAPHICS
+    if _GRAPHICS is None:
+        graphics = [
+            Image.open(os.path.join(os.path.dirname(__file__), "images/empty.png")).convert('RGBA'),  # enum 0 empty
+            Image.open(os.path.join(os.path.dirname(__file__), "images/solid.png")).convert('RGBA'),  # enum 1 wall
+            Image.open(os.path.join(os.path.dirname(__file__), "images/path.png")).convert('RGBA'),   # enum 2 path
+            Image.open(os.path.join(os.path.dirname(__file__), "images/solid.png")).convert('RGBA'),  # enum 3 border
+        ]
+        _GRAPHICS = np.stack([np.array(g, dtype=np.uint8) for g in graphics])
+    return _GRAPHICS
+
 class BinaryProblem(Problem):
     def __init__(self, **kwargs):
         Problem.__init__(self, **kwargs)
@@ -28,28 +47,49 @@ class BinaryProblem(Problem):
         # Ensure min_value doesn't exceed max_value for IntegerSpace
         min_path = min(self._target + self._cerror, self._max_path - 1)
         self._control_space = DictionarySpace({"path": IntegerSpace(min_path, self._max_path)})
-        
+
+        # info() is deterministic in content, so cache it per content hash
+        self._info_cache = {}
+        self._info_cache_size = 4096
 
     def info(self, content):
-        content = np.array(content)
-        number_regions = get_number_regions(content, [Tile.EMPTY])
-        # longest = get_longest_path(content, [Tile.EMPTY])
-        longest, d_map = get_longest_path_and_coords(content, [Tile.EMPTY])
-
-        return {"path": longest, 
-                "regions": number_regions, 
-                "flat": content.flatten(),
+        content = np.ascontiguousarray(content, dtype=np.int8)
+        key = content.tobytes()
+        cached = self._info_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # regions and longest path share one labeling pass over the maze
+        number_regions, longest, d_map = get_regions_and_longest_path(content, [Tile.EMPTY])
+
+        result = {"path": longest,
+                "regions": number_regions,
+                # bit-packed {0,1} tiles so diversity is a popcount over H*W/8 bytes
+                "flat": np.packbits(content.flatten().astype(np.uint8)),
                 "d_map": d_map,}
 
+        if len(self._info_cache) >= self._info_cache_size:
+            self._info_cache.pop(next(iter(self._info_cache)))
+        self._info_cache[key] = result
+        return result
+
     def quality(self, info):
         number_regions = get_range_reward(info["regions"], 0, 1, 1, self._width * self._height / 10)
         longest = get_range_reward(info["path"], 0, self._target, self._max_path)
         return (number_regions + longest) / 2
     
     def diversity(self, info1, info2):
-        hamming = abs(info1["flat"] - info2["flat"]).sum()
+        hamming = np.unpackbits(info1["flat"] ^ info2["flat"]).sum()
         return get_range_reward(hamming, 0, self._diversity * self._width * self._height, self._width * self._height)
-    
+
+    def batch_diversity(self, infos):
+        hamming = get_batch_hamming([info["flat"] for info in infos])
+        diversity = np.zeros((len(infos), len(infos)))
+        for i1 in range(len(infos)):
+            for i2 in range(len(infos)):
+                diversity[i1][i2] = get_range_reward(hamming[i1][i2], 0, self._diversity * self._width * self._height, self._width * self._height)
+        return diversity
+
     def controlability(self, info, control):
         cerror = max(int(control["path"] * 0.1), 1)
         longest = get_range_reward(info["path"], 0, control["path"]-cerror, control["path"]+cerror, self._max_path)
@@ -57,78 +97,110 @@ class BinaryProblem(Problem):
     
     def render(self, content, info=None):
         scale = 16
-        graphics = [
-            Image.open(os.path.join(os.path.dirname(__file__), "images/empty.png")).convert('RGBA'),  # enum 0 empty
-            Image.open(os.path.join(os.path.dirname(__file__), "images/solid.png")).convert('RGBA'),  # enum 1 wall
-            Image.open(os.path.join(os.path.dirname(__file__), "images/path.png")).convert('RGBA'),   # enum 2 path
-            Image.open(os.path.join(os.path.dirname(__file__), "images/solid.png")).convert('RGBA'),  # enum 3 border
-        ]
+        tiles = _load_graphics()
 
         # Pad with border tiles
-        padded_content = np.pad(np.array(content), 1, constant_values=3)
-        lvl_image = Image.new("RGBA", (padded_content.shape[1]*scale, padded_content.shape[0]*scale), (0, 0, 0, 255))
+        padded_content = np.pad(np.asarray(content, dtype=np.int8), 1, constant_values=3)
+        height, width = padded_content.shape
 
-        # Draw base tiles
-        for y in range(padded_content.shape[0]):
-            for x in range(padded_content.shape[1]):
-                tile_idx = padded_content[y, x]
-                lvl_image.paste(graphics[tile_idx], (x*scale, y*scale, (x+1)*scale, (y+1)*scale))
+        # Gather the tile for every cell in one shot: (H, W, scale, scale, 4)
+        canvas = tiles[padded_content]
 
-        # Draw path tiles over the base tiles
+        # Alpha-composite path tiles over the base tiles
         if info and "d_map" in info:
             d_map = info["d_map"]
             path_coords = get_path_coords(d_map)
 
+            path_mask = np.zeros(padded_content.shape, dtype=bool)
             for y, x in path_coords:
                 # Offset +1 due to padding
-                py, px = y + 1, x + 1
-                lvl_image.paste(graphics[2], (px*scale, py*scale, (px+1)*scale, (py+1)*scale), mask=graphics[2])
+                path_mask[y + 1, x + 1] = True
+
+            path_tile = tiles[2].astype(np.float32)
+            alpha = path_tile[..., 3:] / 255.0
+            blended = path_tile * alpha + canvas[path_mask].astype(np.float32) * (1.0 - alpha)
+            canvas[path_mask] = (blended + 0.5).astype(np.uint8)
 
-        return lvl_image
+        # Collapse the block structure into a single (H*scale, W*scale, 4) image
+        canvas = canvas.transpose(0, 2, 1, 3, 4).reshape(height * scale, width * scale, 4)
+        return Image.fromarray(canvas, "RGBA")
 
 def get_path_coords(arr):
     """
     Backtrack from the maximum value in the dijkstra map to 0,
     following the descending path.
     """
-    # Find the maximum value and its position
-    max_val = np.max(arr)
-    max_positions = np.argwhere(arr == max_val)
-    
-    if len(max_positions) == 0:
+    arr = np.ascontiguousarray(arr, dtype=np.int32)
+
+    if arr.size == 0:
         raise ValueError("No maximum value found in the array!")
-    
-    # If multiple max positions, take the first one
-    max_pos = tuple(max_positions[0])
-    
-    path = [max_pos]
-    current = max_pos
-    current_val = max_val
-
-    # Backtrack from max_val down to 0
-    while current_val > 0:
-        y, x = current
-        found_next = False
-        
-        # Check 4-neighbors (up, down, left, right)
-        for dy, dx in [(-1,0), (1,0), (0,-1), (0,1)]:
-            ny, nx = y + dy, x + dx
-            
-            # Check bounds
-            if 0 <= ny < arr.shape[0] and 0 <= nx < arr.shape[1]:
-                neighbor_val = arr[ny, nx]
-                
-                # Look for the neighbor with value current_val - 1
-                if neighbor_val == current_val - 1:
-                    current = (ny, nx)
-                    path.append(current)
-                    current_val -= 1
-                    found_next = True
-                    break
-        
-        if not found_next:
-            print(f"Warning: No valid neighbor found at position {current} with value {current_val}")
-            print(f"Neighbors: {[(y+dy, x+dx, arr[y+dy, x+dx] if 0 <= y+dy < arr.shape[0] and 0 <= x+dx < arr.shape[1] else 'OOB') for dy, dx in [(-1,0), (1,0), (0,-1), (0,1)]]}")
-            break
-    
-    return path
\ No newline at end of file
+
+    # Find the maximum value and its (first) position in a single pass
+    flat_idx = int(arr.argmax())
+    max_pos = np.unravel_index(flat_idx, arr.shape)
+    max_val = int(arr[max_pos])
+
+    coords = _make_backtracker(arr.shape[0], arr.shape[1])(arr, max_pos[0], max_pos[1], max_val)
+    return [(y, x) for y, x in coords]
+
+_BACKTRACKERS = {}
+
+def _make_backtracker(height, width):
+    """
+    Build the jitted backtracking kernel with the grid shape baked in as
+    compile-time constants, letting LLVM fold the bounds checks. One kernel
+    is compiled and memoized per d_map shape.
+    """
+    key = (height, width)
+    kernel = _BACKTRACKERS.get(key)
+    if kernel is not None:
+        return kernel
+
+    h, w = height, width
+
+    @njit
+    def kernel(arr, start_y, start_x, max_val):
+        """
+        Backtracking loop from (start_y, start_x) down to 0. Returns a
+        (length, 2) int32 array of (y, x) positions along the descending path.
+        """
+        size = max_val + 1
+        if size < 1:
+            size = 1
+        path = np.empty((size, 2), dtype=np.int32)
+
+        # Walk a flat view so each neighbor probe is one stride add + load
+        flat = arr.ravel()
+        n = h * w
+        i = start_y * w + start_x
+        col = start_x
+        path[0, 0] = start_y
+        path[0, 1] = start_x
+        length = 1
+        current_val = max_val
+
+        # Backtrack from max_val down to 0 over the 4-neighbors (up, down, left, right)
+        while current_val > 0:
+            target = current_val - 1
+            if i >= w and flat[i - w] == target:
+                i -= w
+            elif i < n - w and flat[i + w] == target:
+                i += w
+            elif col > 0 and flat[i - 1] == target:
+                i -= 1
+                col -= 1
+            elif col < w - 1 and flat[i + 1] == target:
+                i += 1
+                col += 1
+            else:
+                # No valid descending neighbor, stop early
+                break
+            path[length, 0] = i // w
+            path[length, 1] = i % w
+            length += 1
+            current_val -= 1
+
+        return path[:length]
+
+    _BACKTRACKERS[key] = kernel
+    return kernel
\ No newline at end of file
@@ -1,11 +1,11 @@
 from pcg_benchmark.probs import Problem
 from pcg_benchmark.spaces import ArraySpace, IntegerSpace, DictionarySpace
-from pcg_benchmark.probs.utils import get_range_reward, get_number_regions
+from pcg_benchmark.probs.utils import get_range_reward, get_number_regions, get_batch_hamming
 import numpy as np
+from numba import njit
 from PIL import Image
 from enum import IntEnum
 import os
-from collections import deque
 
 
 class Tile(IntEnum):
@@ -13,6 +13,27 @@ class Tile(IntEnum):
     WALL = 1
 
 
+_GRAPHICS = None
+
+
+def _load_graphics():
+    """Decode the tile graphics into a stacked (n_tiles, 16, 16, 4) RGBA array.
+
+    The PNG files are opened and decoded exactly once per process.
+    """
+    global _GRAPHICS
+    if _GRAPHICS is None:
+        graphics = [
+            Image.open(os.path.join(os.path.dirname(__file__), "images/empty.png")).convert('RGBA'),  # 0 empty
+            Image.open(os.path.join(os.path.dirname(__file__), "images/solid.png")).convert('RGBA'),  # 1 wall
+            Image.open(os.path.join(os.path.dirname(__file__), "images/path.png")).convert('RGBA'),   # 2 path
+            Image.open(os.path.join(os.path.dirname(__file__), "images/solid.png")).convert('RGBA'),  # 3 border
+            Image.open(os.path.join(os.path.dirname(__file__), "images/door.png")).convert('RGBA'),   # 4 door
+        ]
+        _GRAPHICS = np.stack([np.array(g, dtype=np.uint8) for g in graphics])
+    return _GRAPHICS
+
+
 class BinaryDoorProblem(Problem):
     """Binary maze with two door openings in the wall border.
 
@@ -22,6 +43,9 @@ class BinaryDoorProblem(Problem):
     perimeter distance to avoid trivial configurations.
     """
 
+    # perimeter arrays memoized per (height, width) across instances
+    _BORDER_CACHE = {}
+
     def __init__(self, **kwargs):
         Problem.__init__(self, **kwargs)
         self._width = kwargs.get("width")
@@ -40,29 +64,36 @@ class BinaryDoorProblem(Problem):
         # Generate deterministic door positions
         self._door1, self._door2 = self._generate_doors()
 
+        # Reusable augmented buffer: wall border with the doors opened; only the
+        # interior changes between info() calls
+        self._aug_buf = np.full((self._height + 2, self._width + 2), int(Tile.WALL), dtype=np.int8)
+        self._aug_buf[self._door1[0], self._door1[1]] = int(Tile.EMPTY)
+        self._aug_buf[self._door2[0], self._door2[1]] = int(Tile.EMPTY)
+
+        # info() is deterministic in content, so cache it per content hash
+        self._info_cache = {}
+        self._info_cache_size = 4096
+
     def _generate_doors(self):
         """Generate two door positions on the non-corner border of the augmented grid.
 
         Returns two (row, col) positions in the augmented (H+2)x(W+2) grid.
         Minimum perimeter distance >= min(W, H) to prevent trivial configs.
         """
-        ah = self._height + 2  # augmented height
-        aw = self._width + 2   # augmented width
-
-        # Enumerate non-corner border positions as an ordered perimeter cycle
-        # Top row (left to right, excluding corners)
-        border = []
-        for c in range(1, aw - 1):
-            border.append((0, c))
-        # Right column (top to bottom, excluding corners)
-        for r in range(1, ah - 1):
-            border.append((r, aw - 1))
-        # Bottom row (right to left, excluding corners)
-        for c in range(aw - 2, 0, -1):
-            border.append((ah - 1, c))
-        # Left column (bottom to top, excluding corners)
-        for r in range(ah - 2, 0, -1):
-            border.append((r, 0))
+        border = self._BORDER_CACHE.get((self._height, self._width))
+        if border is None:
+            ah = self._height + 2  # augmented height
+            aw = self._width + 2   # augmented width
+
+            # Enumerate non-corner border positions as an ordered perimeter cycle:
+            # top row (left to right), right column (top to bottom), bottom row
+            # (right to left), left column (bottom to top) - corners excluded
+            top = np.stack([np.zeros(aw - 2, dtype=np.int64), np.arange(1, aw - 1)], axis=1)
+            right = np.stack([np.arange(1, ah - 1), np.full(ah - 2, aw - 1, dtype=np.int64)], axis=1)
+            bottom = np.stack([np.full(aw - 2, ah - 1, dtype=np.int64), np.arange(aw - 2, 0, -1)], axis=1)
+            left = np.stack([np.arange(ah - 2, 0, -1), np.zeros(ah - 2, dtype=np.int64)], axis=1)
+            border = np.concatenate([top, right, bottom, left])
+            self._BORDER_CACHE[(self._height, self._width)] = border
 
         perimeter_len = len(border)
         min_dist = min(self._width, self._height)
@@ -71,47 +102,35 @@ class BinaryDoorProblem(Problem):
 
         # Pick door1 randomly
         idx1 = rng.randint(0, perimeter_len)
-        door1 = border[idx1]
-
-        # Find candidates for door2 with perimeter distance >= min_dist
-        candidates = []
-        for i, pos in enumerate(border):
-            # Perimeter distance (shortest walk around the perimeter)
-            d_forward = (i - idx1) % perimeter_len
-            d_backward = (idx1 - i) % perimeter_len
-            peri_dist = min(d_forward, d_backward)
-            if peri_dist >= min_dist:
-                candidates.append((i, peri_dist))
-
-        if candidates:
+
+        # Perimeter distance (shortest walk around the perimeter) to every position
+        idxs = np.arange(perimeter_len)
+        peri_dist = np.minimum((idxs - idx1) % perimeter_len, (idx1 - idxs) % perimeter_len)
+
+        # Candidates for door2 with perimeter distance >= min_dist
+        candidates = np.flatnonzero(peri_dist >= min_dist)
+        if len(candidates) > 0:
             # Pick randomly among valid candidates
             ci = rng.randint(0, len(candidates))
-            idx2 = candidates[ci][0]
+            idx2 = candidates[ci]
         else:
             # Fallback: pick the farthest position
-            best_dist = -1
-            best_idx = (idx1 + perimeter_len // 2) % perimeter_len
-            for i in range(perimeter_len):
-                if i == idx1:
-                    continue
-                d_forward = (i - idx1) % perimeter_len
-                d_backward = (idx1 - i) % perimeter_len
-                peri_dist = min(d_forward, d_backward)
-                if peri_dist > best_dist:
-                    best_dist = peri_dist
-                    best_idx = i
-            idx2 = best_idx
-
-        door2 = border[idx2]
+            peri_dist[idx1] = -1
+            idx2 = np.argmax(peri_dist)
+
+        door1 = (int(border[idx1][0]), int(border[idx1][1]))
+        door2 = (int(border[idx2][0]), int(border[idx2][1]))
         return door1, door2
 
     def _build_augmented(self, content):
-        """Build augmented grid: pad content with walls, then open doors."""
-        content = np.array(content)
-        augmented = np.pad(content, 1, constant_values=int(Tile.WALL))
-        augmented[self._door1[0], self._door1[1]] = int(Tile.EMPTY)
-        augmented[self._door2[0], self._door2[1]] = int(Tile.EMPTY)
-        return augmented
+        """Build augmented grid: content inside the preallocated walled border.
+
+        Returns the per-instance buffer; callers must not hold on to it across
+        info() calls or mutate it.
+        """
+        # doors sit on the border, so only the interior needs refreshing
+        self._aug_buf[1:-1, 1:-1] = np.asarray(content, dtype=np.int8)
+        return self._aug_buf
 
     def _bfs_path(self, augmented, start, end):
         """BFS from start to end on the augmented grid.
@@ -119,55 +138,53 @@ class BinaryDoorProblem(Problem):
         Returns (path_length, distance_map).  path_length is 0 if no path.
         Distance map has -1 for unvisited cells.
         """
-        h, w = augmented.shape
-        d_map = np.full((h, w), -1, dtype=np.int32)
-
-        if augmented[start[0], start[1]] != int(Tile.EMPTY):
-            return 0, d_map
-        if augmented[end[0], end[1]] != int(Tile.EMPTY):
-            return 0, d_map
-
-        d_map[start[0], start[1]] = 0
-        queue = deque([start])
-
-        while queue:
-            r, c = queue.popleft()
-            if (r, c) == end:
-                return int(d_map[r, c]), d_map
-
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < h and 0 <= nc < w:
-                    if d_map[nr, nc] == -1 and augmented[nr, nc] == int(Tile.EMPTY):
-                        d_map[nr, nc] = d_map[r, c] + 1
-                        queue.append((nr, nc))
-
-        return 0, d_map
+        augmented = np.ascontiguousarray(augmented, dtype=np.int8)
+        length, d_map = _bfs_numba(augmented, start[0], start[1], end[0], end[1])
+        return length, d_map
 
     def info(self, content):
-        content = np.array(content)
+        content = np.ascontiguousarray(content, dtype=np.int8)
+        key = content.tobytes()
+        cached = self._info_cache.get(key)
+        if cached is not None:
+            return cached
+
         augmented = self._build_augmented(content)
         number_regions = get_number_regions(content, [Tile.EMPTY])
         door_path, d_map = self._bfs_path(augmented, self._door1, self._door2)
 
-        return {
+        result = {
             "door_path": door_path,
             "regions": number_regions,
-            "flat": content.flatten(),
+            # bit-packed {0,1} tiles so diversity is a popcount over H*W/8 bytes
+            "flat": np.packbits(content.flatten().astype(np.uint8)),
             "d_map": d_map,
             "door1": self._door1,
             "door2": self._door2,
         }
 
+        if len(self._info_cache) >= self._info_cache_size:
+            self._info_cache.pop(next(iter(self._info_cache)))
+        self._info_cache[key] = result
+        return result
+
     def quality(self, info):
         number_regions = get_range_reward(info["regions"], 0, 1, 1, self._width * self._height / 10)
         door_path_reward = get_range_reward(info["door_path"], 0, self._target, self._max_path)
         return (number_regions + door_path_reward) / 2
 
     def diversity(self, info1, info2):
-        hamming = abs(info1["flat"] - info2["flat"]).sum()
+        hamming = np.unpackbits(info1["flat"] ^ info2["flat"]).sum()
         return get_range_reward(hamming, 0, self._diversity * self._width * self._height, self._width * self._height)
 
+    def batch_diversity(self, infos):
+        hamming = get_batch_hamming([info["flat"] for info in infos])
+        diversity = np.zeros((len(infos), len(infos)))
+        for i1 in range(len(infos)):
+            for i2 in range(len(infos)):
+                diversity[i1][i2] = get_range_reward(hamming[i1][i2], 0, self._diversity * self._width * self._height, self._width * self._height)
+        return diversity
+
     def controlability(self, info, control):
         cerror = max(int(control["door_path"] * 0.1), 1)
         door_path = get_range_reward(
@@ -205,34 +222,108 @@ class BinaryDoorProblem(Problem):
 
     def render(self, content, info=None):
         scale = 16
-        graphics = [
-            Image.open(os.path.join(os.path.dirname(__file__), "images/empty.png")).convert('RGBA'),  # 0 empty
-            Image.open(os.path.join(os.path.dirname(__file__), "images/solid.png")).convert('RGBA'),  # 1 wall
-            Image.open(os.path.join(os.path.dirname(__file__), "images/path.png")).convert('RGBA'),   # 2 path
-            Image.open(os.path.join(os.path.dirname(__file__), "images/solid.png")).convert('RGBA'),  # 3 border
-            Image.open(os.path.join(os.path.dirname(__file__), "images/door.png")).convert('RGBA'),   # 4 door
-        ]
+        tiles = _load_graphics()
 
-        content = np.array(content)
+        content = np.asarray(content, dtype=np.int8)
         # Build augmented with border=3, doors=4
         padded = np.pad(content, 1, constant_values=3)
         padded[self._door1[0], self._door1[1]] = 4
         padded[self._door2[0], self._door2[1]] = 4
+        height, width = padded.shape
 
-        lvl_image = Image.new("RGBA", (padded.shape[1] * scale, padded.shape[0] * scale), (0, 0, 0, 255))
+        # Gather the tile for every cell in one shot: (H, W, scale, scale, 4)
+        canvas = tiles[padded]
 
-        # Draw base tiles
-        for y in range(padded.shape[0]):
-            for x in range(padded.shape[1]):
-                tile_idx = padded[y, x]
-                lvl_image.paste(graphics[tile_idx], (x * scale, y * scale, (x + 1) * scale, (y + 1) * scale))
-
-        # Draw path from door1 to door2 if info available
+        # Alpha-composite the path from door1 to door2 if info available
         if info and "d_map" in info and info.get("door_path", 0) > 0:
             d_map = info["d_map"]
             path_coords = self._backtrack_path(d_map, self._door2)
+
+            # d_map is in augmented coordinates, which match padded coordinates
+            path_mask = np.zeros(padded.shape, dtype=bool)
             for r, c in path_coords:
-                # d_map is in augmented coordinates, which match padded coordinates
-                lvl_image.paste(graphics[2], (c * scale, r * scale, (c + 1) * scale, (r + 1) * scale), mask=graphics[2])
+                path_mask[r, c] = True
+
+            path_tile = tiles[2].astype(np.float32)
+            alpha = path_tile[..., 3:] / 255.0
+            blended = path_tile * alpha + canvas[path_mask].astype(np.float32) * (1.0 - alpha)
+            canvas[path_mask] = (blended + 0.5).astype(np.uint8)
+
+        # Collapse the block structure into a single (H*scale, W*scale, 4) image
+        canvas = canvas.transpose(0, 2, 1, 3, 4).reshape(height * scale, width * scale, 4)
+        return Image.fromarray(canvas, "RGBA")
+
+@njit(cache=True)
+def _bfs_numba(augmented, sr, sc, er, ec):
+    """Jitted BFS over the augmented grid using a flat int32 ring buffer.
+
+    Cells are encoded as r*w+c in the queue to stay in nopython mode.
+    Returns (path_length, distance_map) with -1 for unvisited cells.
+
+    The grid is wall-bordered with only the two doors open, so after the
+    start door is expanded with bounds checks, every later dequeued cell
+    is either interior (all four neighbors in bounds) or the end door,
+    which returns before its neighbors are scanned. That lets the main
+    loop skip the per-neighbor bounds checks entirely.
+    """
+    h, w = augmented.shape
+    d_map = np.full((h, w), -1, dtype=np.int32)
+
+    if augmented[sr, sc] != 0:
+        return 0, d_map
+    if augmented[er, ec] != 0:
+        return 0, d_map
+
+    d_map[sr, sc] = 0
+    if sr == er and sc == ec:
+        return 0, d_map
 
-        return lvl_image
+    queue = np.empty(h * w, dtype=np.int32)
+    tail = 0
+
+    # Expand the start door with bounds checks (it sits on the border)
+    if sr > 0 and d_map[sr - 1, sc] == -1 and augmented[sr - 1, sc] == 0:
+        d_map[sr - 1, sc] = 1
+        queue[tail] = (sr - 1) * w + sc
+        tail += 1
+    if sr < h - 1 and d_map[sr + 1, sc] == -1 and augmented[sr + 1, sc] == 0:
+        d_map[sr + 1, sc] = 1
+        queue[tail] = (sr + 1) * w + sc
+        tail += 1
+    if sc > 0 and d_map[sr, sc - 1] == -1 and augmented[sr, sc - 1] == 0:
+        d_map[sr, sc - 1] = 1
+        queue[tail] = sr * w + sc - 1
+        tail += 1
+    if sc < w - 1 and d_map[sr, sc + 1] == -1 and augmented[sr, sc + 1] == 0:
+        d_map[sr, sc + 1] = 1
+        queue[tail] = sr * w + sc + 1
+        tail += 1
+
+    head = 0
+    while head < tail:
+        cell = queue[head]
+        head += 1
+        r = cell // w
+        c = cell % w
+        if r == er and c == ec:
+            return int(d_map[r, c]), d_map
+
+        next_d = d_map[r, c] + 1
+        if d_map[r - 1, c] == -1 and augmented[r - 1, c] == 0:
+            d_map[r - 1, c] = next_d
+            queue[tail] = cell - w
+            tail += 1
+        if d_map[r + 1, c] == -1 and augmented[r + 1, c] == 0:
+            d_map[r + 1, c] = next_d
+            queue[tail] = cell + w
+            tail += 1
+        if d_map[r, c - 1] == -1 and augmented[r, c - 1] == 0:
+            d_map[r, c - 1] = next_d
+            queue[tail] = cell - 1
+            tail += 1
+        if d_map[r, c + 1] == -1 and augmented[r, c + 1] == 0:
+            d_map[r, c + 1] = next_d
+            queue[tail] = cell + 1
+            tail += 1
+
+    return 0, d_map
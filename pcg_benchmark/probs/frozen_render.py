@@ -20,30 +20,23 @@ def create_frozen_overlay(image, frozen_mask, scale=16, opacity=0.3):
     Returns:
         PIL Image with frozen tile overlay
     """
-    # Create a blue overlay image
-    overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-    
+    frozen_mask = np.asarray(frozen_mask, dtype=bool)
+
     # Blue color with transparency
     blue_color = (0, 100, 255, int(255 * opacity))
-    
-    # Draw rectangles for frozen tiles
-    for y in range(frozen_mask.shape[0]):
-        for x in range(frozen_mask.shape[1]):
-            if frozen_mask[y, x]:
-                # Calculate pixel coordinates
-                left = x * scale
-                top = y * scale
-                right = left + scale
-                bottom = top + scale
-                
-                # Draw the blue rectangle
-                draw.rectangle([left, top, right, bottom], fill=blue_color)
-    
+
+    # Upscale the mask to pixel resolution and fill the overlay in one assignment
+    pixel_mask = np.kron(frozen_mask, np.ones((scale, scale), dtype=bool))
+    overlay_array = np.zeros((image.size[1], image.size[0], 4), dtype=np.uint8)
+    height = min(pixel_mask.shape[0], overlay_array.shape[0])
+    width = min(pixel_mask.shape[1], overlay_array.shape[1])
+    overlay_array[:height, :width][pixel_mask[:height, :width]] = blue_color
+    overlay = Image.fromarray(overlay_array, 'RGBA')
+
     # Composite the overlay onto the original image
     if image.mode != 'RGBA':
         image = image.convert('RGBA')
-    
+
     result = Image.alpha_composite(image, overlay)
     return result
 
@@ -169,24 +162,18 @@ def render_frozen_mask_only(frozen_mask, scale=16):
     Returns:
         PIL Image showing only the frozen tiles
     """
-    width = frozen_mask.shape[1] * scale
-    height = frozen_mask.shape[0] * scale
-    
-    image = Image.new('RGBA', (width, height), (255, 255, 255, 255))
-    draw = ImageDraw.Draw(image)
-    
-    for y in range(frozen_mask.shape[0]):
-        for x in range(frozen_mask.shape[1]):
-            left = x * scale
-            top = y * scale
-            right = left + scale
-            bottom = top + scale
-            
-            if frozen_mask[y, x]:
-                # Frozen tile - blue
-                draw.rectangle([left, top, right, bottom], fill=(0, 100, 255, 255), outline=(0, 0, 0, 255))
-            else:
-                # Normal tile - light gray
-                draw.rectangle([left, top, right, bottom], fill=(240, 240, 240, 255), outline=(200, 200, 200, 255))
-    
-    return image
\ No newline at end of file
+    frozen_mask = np.asarray(frozen_mask, dtype=bool)
+    height, width = frozen_mask.shape
+
+    # Build one outlined tile per state and gather them per cell
+    # Normal tile - light gray
+    normal_tile = np.full((scale, scale, 4), (240, 240, 240, 255), dtype=np.uint8)
+    normal_tile[0, :] = normal_tile[-1, :] = normal_tile[:, 0] = normal_tile[:, -1] = (200, 200, 200, 255)
+    # Frozen tile - blue
+    frozen_tile = np.full((scale, scale, 4), (0, 100, 255, 255), dtype=np.uint8)
+    frozen_tile[0, :] = frozen_tile[-1, :] = frozen_tile[:, 0] = frozen_tile[:, -1] = (0, 0, 0, 255)
+
+    tiles = np.stack([normal_tile, frozen_tile])
+    canvas = tiles[frozen_mask.astype(np.uint8)]
+    canvas = canvas.transpose(0, 2, 1, 3, 4).reshape(height * scale, width * scale, 4)
+    return Image.fromarray(canvas, 'RGBA')
\ No newline at end of file
@@ -8,6 +8,31 @@ All functions are backward compatible - if no frozen constraints are specified,
 the problem behaves exactly as before.
 """
 
+"""
+Resolve the array shape and the per-tile value space for a problem's content
+space. FrozenArraySpace instances expose these directly; plain ArraySpace
+instances are inferred from the problem's width/height and the nested value
+structure.
+
+Parameters:
+    problem: the problem instance whose content space is inspected
+
+Returns:
+    tuple: (dimensions, value_space), or (None, None) when they cannot be resolved
+"""
+def _resolve_dims_and_value_space(problem):
+    original_space = problem._content_space
+    if hasattr(original_space, '_dimensions'):
+        return original_space._dimensions, original_space._value
+    if hasattr(problem, '_width') and hasattr(problem, '_height'):
+        dimensions = (problem._height, problem._width)
+        # Extract the value space from the original ArraySpace
+        value_space = original_space._value[0]
+        if hasattr(value_space, '__getitem__'):
+            value_space = value_space[0]
+        return dimensions, value_space
+    return None, None
+
 def create_frozen_random_problem(problem_class, probability=0.1, seed=None, **kwargs):
     """
     Create a problem instance with randomly frozen tiles.
@@ -24,18 +49,7 @@ def create_frozen_random_problem(problem_class, probability=0.1, seed=None, **kw
     problem = problem_class(**kwargs)
     
     # Replace the content space with a frozen version
-    original_space = problem._content_space
-    if hasattr(original_space, '_dimensions'):
-        dimensions = original_space._dimensions
-        value_space = original_space._value
-    else:
-        # Try to infer from the problem's width/height
-        if hasattr(problem, '_width') and hasattr(problem, '_height'):
-            dimensions = (problem._height, problem._width)
-            # Extract the value space from the original ArraySpace
-            value_space = original_space._value[0]
-            if hasattr(value_space, '__getitem__'):
-                value_space = value_space[0]
+    dimensions, value_space = _resolve_dims_and_value_space(problem)
     
     if dimensions and value_space:
         frozen_space = FrozenArraySpace(dimensions, value_space)
@@ -60,28 +74,15 @@ def create_frozen_template_problem(problem_class, template_mask, template_values
     problem = problem_class(**kwargs)
     
     # Replace the content space with a frozen version
-    original_space = problem._content_space
-    if hasattr(original_space, '_dimensions'):
-        dimensions = original_space._dimensions
-        value_space = original_space._value
-    else:
-        # Try to infer from the problem's width/height
-        if hasattr(problem, '_width') and hasattr(problem, '_height'):
-            dimensions = (problem._height, problem._width)
-            # Extract the value space from the original ArraySpace
-            value_space = original_space._value[0]
-            if hasattr(value_space, '__getitem__'):
-                value_space = value_space[0]
+    dimensions, value_space = _resolve_dims_and_value_space(problem)
     
     if dimensions and value_space:
         frozen_space = FrozenArraySpace(dimensions, value_space, template_mask)
-        
-        # Set frozen values based on template
-        frozen_coords = np.where(template_mask)
-        for i in range(len(frozen_coords[0])):
-            coord_tuple = tuple(frozen_coords[j][i] for j in range(len(frozen_coords)))
-            frozen_space.set_frozen(coord_tuple, template_values[coord_tuple])
-        
+
+        # Set frozen values based on the template in one masked assignment
+        frozen_space.set_frozen_from_mask(np.asarray(template_mask, dtype=bool),
+                                          np.asarray(template_values))
+
         problem._content_space = frozen_space
     
     return problem
@@ -126,18 +127,7 @@ def create_frozen_positions_problem(problem_class, tile_type, positions, **kwarg
     problem = problem_class(**kwargs)
     
     # Replace the content space with a frozen version
-    original_space = problem._content_space
-    if hasattr(original_space, '_dimensions'):
-        dimensions = original_space._dimensions
-        value_space = original_space._value
-    else:
-        # Try to infer from the problem's width/height
-        if hasattr(problem, '_width') and hasattr(problem, '_height'):
-            dimensions = (problem._height, problem._width)
-            # Extract the value space from the original ArraySpace
-            value_space = original_space._value[0]
-            if hasattr(value_space, '__getitem__'):
-                value_space = value_space[0]
+    dimensions, value_space = _resolve_dims_and_value_space(problem)
     
     if dimensions and value_space:
         frozen_space = FrozenArraySpace(dimensions, value_space)
@@ -162,18 +152,7 @@ def create_frozen_tile_types_problem(problem_class, content, tile_types, **kwarg
     problem = problem_class(**kwargs)
     
     # Replace the content space with a frozen version
-    original_space = problem._content_space
-    if hasattr(original_space, '_dimensions'):
-        dimensions = original_space._dimensions
-        value_space = original_space._value
-    else:
-        # Try to infer from the problem's width/height
-        if hasattr(problem, '_width') and hasattr(problem, '_height'):
-            dimensions = (problem._height, problem._width)
-            # Extract the value space from the original ArraySpace
-            value_space = original_space._value[0]
-            if hasattr(value_space, '__getitem__'):
-                value_space = value_space[0]
+    dimensions, value_space = _resolve_dims_and_value_space(problem)
     
     if dimensions and value_space:
         frozen_space = FrozenArraySpace(dimensions, value_space)
@@ -210,17 +189,7 @@ def create_problem_with_frozen_tiles(problem_class, freeze_tiles=None, **kwargs)
         return problem
     
     # Extract dimensions for creating FrozenArraySpace
-    dimensions = None
-    value_space = None
-    
-    if hasattr(problem, '_width') and hasattr(problem, '_height'):
-        dimensions = (problem._height, problem._width)
-        # Extract the value space from the original ArraySpace
-        if hasattr(problem._content_space, '_value') and hasattr(problem._content_space._value, '__getitem__'):
-            # Navigate through the nested structure to get the actual Space object
-            value_space = problem._content_space._value[0]
-            if hasattr(value_space, '__getitem__'):
-                value_space = value_space[0]
+    dimensions, value_space = _resolve_dims_and_value_space(problem)
     
     # Only replace with FrozenArraySpace if we have valid dimensions and any freezing options
     if dimensions and value_space and any(key in freeze_tiles for key in 
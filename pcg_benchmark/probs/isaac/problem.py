@@ -95,7 +95,7 @@ class IsaacProblem(Problem):
             "loose_connections": loose_connections,
             "locations": len(locations),
             "player_boss_distance": player_boss,
-            "flat": maze_layout.flatten(),
+            "flat": np.ascontiguousarray(maze_layout.flatten(), dtype=np.int8),
             "dead_end": dead_end
         }
     
@@ -117,8 +117,9 @@ class IsaacProblem(Problem):
         return 0.9 * (map_size + regions + functional) / 3 + 0.1 * loose_connections
     
     def diversity(self, info1, info2):
-        hamming_rooms = (abs(info1["flat"] - info2["flat"]) == 1).sum()
-        hamming_connections = (abs(info1["flat"] - info2["flat"]) == 2).sum()
+        diff = abs(info1["flat"] - info2["flat"])
+        hamming_rooms = (diff == 1).sum()
+        hamming_connections = (diff == 2).sum()
         norm_rooms = get_range_reward(hamming_rooms, 0, self._width * self._height)
         norm_connections = get_range_reward(hamming_connections, 0, self._width * self._height)
         return get_range_reward(0.25 * norm_rooms + 0.75 * norm_connections, 0, self._diversity, 1)
@@ -65,7 +65,27 @@ class Problem:
     """
     def diversity(self, info1, info2):
         raise NotImplementedError("diversity function is not implemented")
-    
+
+    """
+    Calculate the diversity between every pair of contents in a population at once.
+    The default implementation loops over all the pairs; subclasses can override it
+    with a vectorized version when the pairwise metric can be batched.
+
+    Parameters:
+        infos(dict[str,any][]): an array of the information about all the contents.
+        Make sure that info function return all the values need to calculate the diversity
+
+    Returns:
+        float[][]: a matrix where entry (i, j) is the diversity between content i and
+        content j, the same value diversity(infos[i], infos[j]) would return
+    """
+    def batch_diversity(self, infos):
+        diversity = np.zeros((len(infos), len(infos)))
+        for i1 in range(len(infos)):
+            for i2 in range(len(infos)):
+                diversity[i1][i2] = self.diversity(infos[i1], infos[i2])
+        return diversity
+
     """
     Calculate the controlability of a content with respect to the control criteria as a value 
     between 0 and 1 where 1 means it passes the benchmark criteria. The controlability function 
@@ -1,6 +1,5 @@
-from collections import deque
-
 import numpy as np
+from numba import njit
 
 """
 Get all the locations of a specific tile value in the 2D array
@@ -34,26 +33,32 @@ Returns:
     int[][]: a binary 2D array where 1 means visited by Dijkstra algorithm and 0 means not
 """
 def _run_dijkstra(x, y, map, passable_values):
-    dijkstra_map = np.full((map.shape[0], map.shape[1]),-1)
-    visited_map = np.zeros((map.shape[0], map.shape[1]))
+    height, width = map.shape
+    dijkstra_map = np.full((height, width),-1)
+    visited_map = np.zeros((height, width))
     passable_set = set(passable_values)
     if map[y][x] not in passable_set:
         return dijkstra_map, visited_map
     dijkstra_map[y][x] = 0
     visited_map[y][x] = 1
-    queue = deque([(x, y)])
-    while queue:
-        cx, cy = queue.popleft()
+    # preallocated ring buffer of y*width+x cells instead of a deque of tuples
+    queue = np.empty(height * width, dtype=np.int32)
+    queue[0] = y * width + x
+    head, tail = 0, 1
+    while head < tail:
+        cy, cx = divmod(int(queue[head]), width)
+        head += 1
         cd = dijkstra_map[cy][cx]
         for (dx,dy) in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
             nx,ny=cx+dx,cy+dy
-            if nx < 0 or ny < 0 or nx >= map.shape[1] or ny >= map.shape[0]:
+            if nx < 0 or ny < 0 or nx >= width or ny >= height:
                 continue
             if dijkstra_map[ny][nx] >= 0 or map[ny][nx] not in passable_set:
                 continue
             dijkstra_map[ny][nx] = cd + 1
             visited_map[ny][nx] = 1
-            queue.append((nx, ny))
+            queue[tail] = ny * width + nx
+            tail += 1
     return dijkstra_map, visited_map
 
 """
@@ -104,20 +109,26 @@ Returns:
 def _flood_fill(x, y, color_map, map, color_index, passable_values):
     if color_map[y][x] != -1 or map[y][x] not in passable_values:
         return 0
+    height, width = map.shape
     num_tiles = 1
     color_map[y][x] = color_index
-    queue = deque([(x, y)])
-    while queue:
-        cx, cy = queue.popleft()
+    # preallocated ring buffer of y*width+x cells instead of a deque of tuples
+    queue = np.empty(height * width, dtype=np.int32)
+    queue[0] = y * width + x
+    head, tail = 0, 1
+    while head < tail:
+        cy, cx = divmod(int(queue[head]), width)
+        head += 1
         for (dx,dy) in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
             nx,ny=cx+dx,cy+dy
-            if nx < 0 or ny < 0 or nx >= map.shape[1] or ny >= map.shape[0]:
+            if nx < 0 or ny < 0 or nx >= width or ny >= height:
                 continue
             if color_map[ny][nx] != -1 or map[ny][nx] not in passable_values:
                 continue
             color_map[ny][nx] = color_index
             num_tiles += 1
-            queue.append((nx, ny))
+            queue[tail] = ny * width + nx
+            tail += 1
     return num_tiles
 
 """
@@ -131,16 +142,69 @@ Returns:
     Number of seperate regions in the maze that have the same values using 1 size Von Neumann neighborhood
 """
 def get_number_regions(maze, tile_values):
-    empty_tiles = _get_certain_tiles(maze, tile_values)
-    region_index=0
-    color_map = np.full((maze.shape[0], maze.shape[1]), -1)
-    for (x,y) in empty_tiles:
-        num_tiles = _flood_fill(x, y, color_map, maze, region_index + 1, tile_values)
-        if num_tiles > 0:
-            region_index += 1
-        else:
-            continue
-    return region_index
+    maze = np.asarray(maze)
+    passable = np.isin(maze, np.asarray(tile_values, dtype=maze.dtype))
+    return _count_regions_numba(passable)
+
+"""
+Find the root of a union-find parent array with path compression
+
+Parameters:
+    parent(int[]): the union-find parent array
+    i(int): the index to find the root of
+
+Returns:
+    int: the root index of the set containing i
+"""
+@njit(cache=True)
+def _uf_find(parent, i):
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    while parent[i] != root:
+        next_i = parent[i]
+        parent[i] = root
+        i = next_i
+    return root
+
+"""
+Count the connected regions of a boolean grid using a two-pass union-find
+over the 1 size Von Neumann neighborhood
+
+Parameters:
+    passable(bool[][]): a 2D boolean grid where True cells form the regions
+
+Returns:
+    int: number of seperate regions in the grid
+"""
+@njit(cache=True)
+def _count_regions_numba(passable):
+    h, w = passable.shape
+    parent = np.full(h * w, -1, dtype=np.int32)
+    # pass 1: scan left-right top-down, union each cell with its left/top neighbors
+    for y in range(h):
+        base = y * w
+        for x in range(w):
+            if not passable[y, x]:
+                continue
+            i = base + x
+            parent[i] = i
+            if x > 0 and parent[i - 1] != -1:
+                root_a = _uf_find(parent, i)
+                root_b = _uf_find(parent, i - 1)
+                if root_a != root_b:
+                    parent[root_a] = root_b
+            if y > 0 and parent[i - w] != -1:
+                root_a = _uf_find(parent, i)
+                root_b = _uf_find(parent, i - w)
+                if root_a != root_b:
+                    parent[root_a] = root_b
+    # pass 2: every region has exactly one root left pointing at itself
+    count = 0
+    for i in range(h * w):
+        if parent[i] == i:
+            count += 1
+    return count
 
 """
 Calculate the size of the regions in the maze specified by the locations that have the same values in the tile_values
@@ -194,6 +258,43 @@ def get_longest_path(maze, tile_values):
     return final_value
 
 
+"""
+Calculate the number of regions and the longest shortest path of a maze in one pass.
+Every region is visited exactly once: the first Dijkstra from an unvisited tile labels
+the whole region (counting it) and seeds the second Dijkstra that measures its longest
+shortest path. This fuses get_number_regions and get_longest_path_and_coords which
+would otherwise each sweep the full maze.
+
+Parameters:
+    maze(int[][]): the maze that need to be tested
+    tile_values(int[]): the values that are passable in the maze
+
+Returns:
+    int: number of seperate regions in the maze
+    int: the longest shortest distance in the maze
+    int[][]: the dijkstra map of the region with the longest shortest path
+"""
+def get_regions_and_longest_path(maze, tile_values):
+    empty_tiles = _get_certain_tiles(maze, tile_values)
+    final_visited_map = np.zeros((maze.shape[0], maze.shape[1]))
+    number_regions = 0
+    final_value = 0
+    d_map = np.full((maze.shape[0], maze.shape[1]), -1)
+    for (x,y) in empty_tiles:
+        if final_visited_map[y][x] > 0:
+            continue
+        number_regions += 1
+        dijkstra_map, visited_map = _run_dijkstra(x, y, maze, tile_values)
+        final_visited_map += visited_map
+        (my,mx) = np.unravel_index(np.argmax(dijkstra_map, axis=None), dijkstra_map.shape)
+        dijkstra_map, _ = _run_dijkstra(mx, my, maze, tile_values)
+        max_value = np.max(dijkstra_map)
+        if max_value >= final_value:
+            final_value = max_value
+            d_map = dijkstra_map
+    return number_regions, final_value, d_map
+
+
 def get_longest_path_and_coords(maze, tile_values):
     empty_tiles = _get_certain_tiles(maze, tile_values)
     final_visited_map = np.zeros((maze.shape[0], maze.shape[1]))
@@ -216,6 +317,26 @@ def get_longest_path_and_coords(maze, tile_values):
             d_map = dijkstra_map
     return final_value, d_map
 """
+Compute the pairwise Hamming distance table for a population of bit-packed contents.
+The packed bytes are unpacked into a (P, bits) 0/1 matrix and the whole P x P table
+comes from two matrix multiplications (matching ones and matching zeros) instead of
+O(P^2) pairwise comparisons.
+
+Parameters:
+    packed_flats(uint8[][]): an array of np.packbits-packed flat contents, all the
+    same length
+
+Returns:
+    int[][]: a P x P matrix where entry (i, j) is the Hamming distance between
+    content i and content j
+"""
+def get_batch_hamming(packed_flats):
+    bits = np.unpackbits(np.stack(packed_flats), axis=1).astype(np.float32)
+    ones = bits @ bits.T
+    zeros = (1.0 - bits) @ (1.0 - bits).T
+    return np.rint(bits.shape[1] - ones - zeros).astype(np.int64)
+
+"""
 Get the distance between two points in a maze
 
 Parameters:
@@ -0,0 +1,32 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    """
+    Scatter the frozen values into a flat sample through precomputed flat
+    indices. Compiled once per dtype signature and cached on disk.
+
+    Parameters:
+        sample_flat(any[]): flat view of the freshly sampled array
+        indices(int[]): raveled indices of the frozen tiles
+        values(any[]): frozen values matching the indices
+    """
+    @njit(cache=True)
+    def apply_frozen(sample_flat, indices, values):
+        for k in range(indices.shape[0]):
+            sample_flat[indices[k]] = values[k]
+else:
+    """
+    Pure numpy fallback when numba is not installed: one fancy-indexed scatter.
+
+    Parameters:
+        sample_flat(any[]): flat view of the freshly sampled array
+        indices(int[]): raveled indices of the frozen tiles
+        values(any[]): frozen values matching the indices
+    """
+    def apply_frozen(sample_flat, indices, values):
+        sample_flat[indices] = values
@@ -1,5 +1,6 @@
 from pcg_benchmark.spaces.generic import GenericSpace
 from pcg_benchmark.spaces.space import Space
+import numpy as np
 
 """
 Return a multidimension array of the internal space in the same shape as dims
@@ -62,4 +63,28 @@ class ArraySpace(GenericSpace):
         any: the range of the internal space
     """
     def range(self):
-        return _getInternalSpaceRange(self._value)
\ No newline at end of file
+        return _getInternalSpaceRange(self._value)
+
+    """
+    Sample a batch of contents in one call. Integer internal spaces are drawn
+    with a single vectorized random call over the whole batch; other internal
+    spaces fall back to sampling one content at a time.
+
+    Parameters:
+        n(int): the number of contents to sample
+
+    Returns:
+        any[]: an array of n sampled contents
+    """
+    def sample_batch(self, n):
+        dims = []
+        leaf = self._value
+        while hasattr(leaf, "__len__"):
+            dims.append(len(leaf))
+            leaf = leaf[0]
+
+        value_range = leaf.range()
+        low, high = value_range.get("min"), value_range.get("max")
+        if isinstance(low, (int, np.integer)) and isinstance(high, (int, np.integer)):
+            return leaf._random.integers(low, high, size=(n,) + tuple(dims))
+        return [self.sample() for _ in range(n)]
\ No newline at end of file
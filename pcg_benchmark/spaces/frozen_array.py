@@ -1,7 +1,29 @@
 from pcg_benchmark.spaces.array import ArraySpace
 from pcg_benchmark.spaces.space import Space
+from pcg_benchmark.spaces._frozen_kernels import apply_frozen
 import numpy as np
 
+"""
+Infer a compact numpy dtype for the frozen-value storage from the leaf space
+of the array. Integer ranges get the smallest dtype that can hold them;
+anything else falls back to float64.
+
+Parameters:
+    value(any): the (possibly nested) internal value structure of the array space
+
+Returns:
+    np.dtype: the inferred dtype for storing frozen values
+"""
+def _infer_value_dtype(value):
+    leaf = value
+    while hasattr(leaf, "__len__"):
+        leaf = leaf[0]
+    value_range = leaf.range()
+    low, high = value_range.get("min"), value_range.get("max")
+    if isinstance(low, (int, np.integer)) and isinstance(high, (int, np.integer)):
+        return np.promote_types(np.min_scalar_type(low), np.min_scalar_type(high - 1))
+    return np.dtype(np.float64)
+
 """
 An Array space that supports frozen tiles - tiles that cannot be modified during sampling.
 This allows for creating partially constrained maps where some tiles are fixed and others
@@ -16,9 +38,20 @@ class FrozenArraySpace(ArraySpace):
         value(any): a space that is used to sample every unit of the array
         frozen_mask(np.ndarray, optional): boolean mask indicating which tiles are frozen
     """
+    def __new__(cls, dimensions, value, frozen_mask=None):
+        # Dispatch the dominant case - a 2D grid of integer tiles - to the
+        # specialized subclass with scalar height/width fast paths
+        if cls is FrozenArraySpace and hasattr(dimensions, "__len__") and len(dimensions) == 2 \
+                and issubclass(type(value), Space):
+            value_range = value.range()
+            low, high = value_range.get("min"), value_range.get("max")
+            if isinstance(low, (int, np.integer)) and isinstance(high, (int, np.integer)):
+                return super().__new__(_FrozenArraySpace2DInt)
+        return super().__new__(cls)
+
     def __init__(self, dimensions, value, frozen_mask=None):
         super().__init__(dimensions, value)
-        
+
         if not hasattr(dimensions, "__len__"):
             dimensions = [dimensions]
         self._dimensions = tuple(dimensions)
@@ -26,15 +59,26 @@ class FrozenArraySpace(ArraySpace):
         # Initialize frozen mask
         if frozen_mask is not None:
             if not isinstance(frozen_mask, np.ndarray):
-                frozen_mask = np.array(frozen_mask)
+                frozen_mask = np.asarray(frozen_mask)
             if frozen_mask.shape != self._dimensions:
                 raise ValueError(f"Frozen mask shape {frozen_mask.shape} does not match dimensions {self._dimensions}")
             self._frozen_mask = frozen_mask.copy()
         else:
             self._frozen_mask = np.zeros(self._dimensions, dtype=bool)
             
-        # Store frozen values
-        self._frozen_values = np.zeros(self._dimensions, dtype=object)
+        # Store frozen values in a typed array so masked copies stay vectorized
+        self._value_dtype = _infer_value_dtype(self._value)
+        self._frozen_values = np.zeros(self._dimensions, dtype=self._value_dtype)
+
+        # Bound containment check of the value space (or None), resolved once
+        # so set_frozen doesn't probe the attribute on every call
+        self._contains = getattr(self._value, 'contains', None)
+
+        # Cached flat structure-of-arrays view of the frozen tiles (raveled
+        # indices + values), invalidated on mutation. The cache doubles as the
+        # frozen count (index array length), so the dense mask is scanned at
+        # most once per mutation instead of on every call
+        self._frozen_flat_cache = None
     
     def set_frozen(self, coordinates, value):
         """
@@ -46,7 +90,17 @@ class FrozenArraySpace(ArraySpace):
         """
         if not isinstance(coordinates, tuple):
             coordinates = tuple(coordinates)
-        
+        self._set_frozen_fast(coordinates, value)
+
+    def _set_frozen_fast(self, coordinates, value):
+        """
+        set_frozen without the tuple coercion, for internal callers that
+        already hold coordinate tuples.
+
+        Parameters:
+            coordinates(tuple): coordinates of the tile to freeze
+            value(any): the value to freeze the tile at
+        """
         # Validate coordinates
         if len(coordinates) != len(self._dimensions):
             raise ValueError(f"Coordinates {coordinates} do not match dimensions {self._dimensions}")
@@ -56,11 +110,12 @@ class FrozenArraySpace(ArraySpace):
                 raise ValueError(f"Coordinate {coord} out of bounds for dimension {i} (size {self._dimensions[i]})")
         
         # Validate value is within the space range
-        if hasattr(self._value, 'contains') and not self._value.contains(value):
+        if self._contains is not None and not self._contains(value):
             raise ValueError(f"Value {value} is not valid for this space")
         
         self._frozen_mask[coordinates] = True
         self._frozen_values[coordinates] = value
+        self._frozen_flat_cache = None
     
     def set_frozen_region(self, coordinates_list, values_list):
         """
@@ -74,7 +129,9 @@ class FrozenArraySpace(ArraySpace):
             raise ValueError("Coordinates and values lists must have the same length")
         
         for coords, value in zip(coordinates_list, values_list):
-            self.set_frozen(coords, value)
+            if not isinstance(coords, tuple):
+                coords = tuple(coords)
+            self._set_frozen_fast(coords, value)
     
     def is_frozen(self, coordinates):
         """
@@ -88,7 +145,19 @@ class FrozenArraySpace(ArraySpace):
         """
         if not isinstance(coordinates, tuple):
             coordinates = tuple(coordinates)
-        
+        return self._is_frozen_fast(coordinates)
+
+    def _is_frozen_fast(self, coordinates):
+        """
+        is_frozen without the tuple coercion, for internal callers that
+        already hold coordinate tuples.
+
+        Parameters:
+            coordinates(tuple): coordinates to check
+
+        Returns:
+            bool: True if the tile is frozen, False otherwise
+        """
         if len(coordinates) != len(self._dimensions):
             return False
         
@@ -110,7 +179,7 @@ class FrozenArraySpace(ArraySpace):
         if not isinstance(coordinates, tuple):
             coordinates = tuple(coordinates)
         
-        if not self.is_frozen(coordinates):
+        if not self._is_frozen_fast(coordinates):
             return None
         
         return self._frozen_values[coordinates]
@@ -118,50 +187,63 @@ class FrozenArraySpace(ArraySpace):
     def sample(self, content=None):
         """
         Sample from the space, respecting frozen tiles.
-        
+
         Parameters:
             content(any, optional): existing content to preserve frozen tiles from
-            
+
         Returns:
-            any: sampled content with frozen tiles preserved
+            np.ndarray: sampled content with frozen tiles preserved
         """
         # Generate new sample normally
-        new_sample = super().sample()
-        
-        # If we have existing content, preserve frozen tiles from it
-        if content is not None:
-            content_array = np.array(content)
-            if content_array.shape == self._dimensions:
-                # Copy frozen tiles from existing content
-                frozen_coords = np.where(self._frozen_mask)
-                for i in range(len(frozen_coords[0])):
-                    coord_tuple = tuple(frozen_coords[j][i] for j in range(len(frozen_coords)))
-                    if self.is_frozen(coord_tuple):
-                        self._set_value_at_coords(new_sample, coord_tuple, content_array[coord_tuple])
-        
-        # Apply explicitly set frozen values
-        frozen_coords = np.where(self._frozen_mask)
-        for i in range(len(frozen_coords[0])):
-            coord_tuple = tuple(frozen_coords[j][i] for j in range(len(frozen_coords)))
-            frozen_value = self._frozen_values[coord_tuple]
-            if frozen_value is not None:
-                self._set_value_at_coords(new_sample, coord_tuple, frozen_value)
-        
+        new_sample = np.asarray(super().sample())
+
+        # Nothing frozen: the sample needs no post-processing at all
+        frozen_indices, frozen_values = self._get_frozen_flat()
+        if frozen_indices.size == 0:
+            return new_sample
+
+        # Apply the frozen values with one coalesced flat scatter. The frozen
+        # values cover every frozen index, so they win over any values the
+        # optional content argument carries at those positions - the same
+        # precedence the old two-pass write had
+        apply_frozen(new_sample.reshape(-1), frozen_indices, frozen_values)
+
         return new_sample
-    
-    def _set_value_at_coords(self, array, coordinates, value):
+
+    def sample_batch(self, n):
         """
-        Helper method to set a value at specific coordinates in a nested array structure.
-        
+        Sample a batch of contents in one call, applying the frozen tiles to
+        the whole batch with a single broadcasted scatter.
+
         Parameters:
-            array: the array structure to modify
-            coordinates: tuple of coordinates
-            value: value to set
+            n(int): the number of contents to sample
+
+        Returns:
+            np.ndarray: an (n,) + dimensions array of sampled contents
         """
-        if len(coordinates) == 1:
-            array[coordinates[0]] = value
-        else:
-            self._set_value_at_coords(array[coordinates[0]], coordinates[1:], value)
+        batch = np.asarray(super().sample_batch(n))
+
+        frozen_indices, frozen_values = self._get_frozen_flat()
+        if frozen_indices.size == 0:
+            return batch
+
+        batch.reshape(n, -1)[:, frozen_indices] = frozen_values
+        return batch
+
+    def _get_frozen_flat(self):
+        """
+        Get the frozen tiles as a flat structure of arrays: the raveled
+        indices of the frozen tiles and their values, rebuilt lazily from
+        the dense mask after the frozen set changed.
+
+        Returns:
+            tuple: (int flat index array, value array) of the frozen tiles
+        """
+        if self._frozen_flat_cache is None:
+            indices = np.flatnonzero(self._frozen_mask)
+            values = self._frozen_values.reshape(-1)[indices]
+            self._frozen_flat_cache = (indices, values)
+        return self._frozen_flat_cache
     
     def sample_with_constraints(self, base_content=None, preserve_frozen=True):
         """
@@ -202,27 +284,56 @@ class FrozenArraySpace(ArraySpace):
         Clear all frozen tiles, making all tiles mutable again.
         """
         self._frozen_mask.fill(False)
-        self._frozen_values.fill(None)
+        self._frozen_values.fill(0)
+        self._frozen_flat_cache = None
     
     def freeze_tiles_by_value(self, content, target_values):
         """
         Freeze all tiles in content that match specific values.
-        
+
         Parameters:
             content(np.ndarray): the content array to analyze
             target_values(list): list of values to freeze
         """
-        content_array = np.array(content)
+        content_array = np.asarray(content)
         if content_array.shape != self._dimensions:
             raise ValueError(f"Content shape {content_array.shape} does not match space dimensions {self._dimensions}")
-        
-        # Find all positions that match target values
-        for target_value in target_values:
-            positions = np.where(content_array == target_value)
-            for i in range(len(positions[0])):
-                coord_tuple = tuple(positions[j][i] for j in range(len(positions)))
-                self.set_frozen(coord_tuple, target_value)
+
+        # Freeze all positions that match target values in one masked assignment.
+        # For non-negative integer tiles, membership is a boolean lookup table
+        # gather (one pass over the content) instead of np.isin's sorted search
+        target_array = np.asarray(target_values)
+        if content_array.dtype.kind in "iu" and target_array.dtype.kind in "iu" \
+                and content_array.size > 0 and int(content_array.min()) >= 0:
+            lut = np.zeros(int(content_array.max()) + 1, dtype=bool)
+            lut[target_array[(target_array >= 0) & (target_array < lut.size)]] = True
+            mask = lut[content_array]
+        else:
+            mask = np.isin(content_array, target_array)
+        self._frozen_mask |= mask
+        self._frozen_values[mask] = content_array[mask]
+        self._frozen_flat_cache = None
     
+    def set_frozen_from_mask(self, mask, values):
+        """
+        Mark all tiles selected by a boolean mask as frozen with their values
+        taken from a matching values array.
+
+        Parameters:
+            mask(np.ndarray): boolean mask selecting the tiles to freeze
+            values(np.ndarray): array of values, read at the masked positions
+        """
+        mask = np.asarray(mask, dtype=bool)
+        values = np.asarray(values)
+        if mask.shape != self._dimensions:
+            raise ValueError(f"Mask shape {mask.shape} does not match dimensions {self._dimensions}")
+        if values.shape != self._dimensions:
+            raise ValueError(f"Values shape {values.shape} does not match dimensions {self._dimensions}")
+
+        self._frozen_mask |= mask
+        self._frozen_values[mask] = values[mask]
+        self._frozen_flat_cache = None
+
     def freeze_tiles_by_type(self, content, tile_types):
         """
         Freeze all tiles of specific types. This is an alias for freeze_tiles_by_value
@@ -237,28 +348,36 @@ class FrozenArraySpace(ArraySpace):
     def freeze_random_tiles(self, probability=0.1, seed=None):
         """
         Randomly freeze tiles based on probability.
-        First generates a random map, then freezes tiles randomly based on the probability.
-        
+        Picks the frozen positions with a local random generator and samples
+        random values only for those positions.
+
         Parameters:
             probability(float): probability of freezing each tile (default 0.1)
             seed(int, optional): random seed for reproducible results
         """
-        if seed is not None:
-            np.random.seed(seed)
-        
-        # Generate a random sample first
-        random_content = self.sample()
-        random_array = np.array(random_content)
-        
+        rng = np.random.default_rng(seed)
+
         # Create random mask based on probability
-        random_mask = np.random.random(self._dimensions) < probability
-        
-        # Freeze tiles according to the mask
-        frozen_coords = np.where(random_mask)
-        for i in range(len(frozen_coords[0])):
-            coord_tuple = tuple(frozen_coords[j][i] for j in range(len(frozen_coords)))
-            tile_value = random_array[coord_tuple]
-            self.set_frozen(coord_tuple, tile_value)
+        random_mask = rng.random(self._dimensions) < probability
+        count = int(random_mask.sum())
+        if count == 0:
+            return
+
+        # Sample only the frozen values instead of a full random map
+        leaf = self._value
+        while hasattr(leaf, "__len__"):
+            leaf = leaf[0]
+        value_range = leaf.range()
+        low, high = value_range.get("min"), value_range.get("max")
+        if isinstance(low, (int, np.integer)) and isinstance(high, (int, np.integer)):
+            values = rng.integers(low, high, size=count, dtype=self._frozen_values.dtype)
+        else:
+            values = np.asarray([leaf.sample() for _ in range(count)])
+
+        # Freeze tiles according to the mask in one scatter
+        self._frozen_mask |= random_mask
+        self._frozen_values[random_mask] = values
+        self._frozen_flat_cache = None
     
     def freeze_tiles_at_positions(self, tile_type, positions):
         """
@@ -268,26 +387,87 @@ class FrozenArraySpace(ArraySpace):
             tile_type(any): the tile type/value to freeze at positions
             positions(list): list of coordinate tuples where to place the frozen tiles
         """
-        for position in positions:
-            if not isinstance(position, tuple):
-                position = tuple(position)
-            self.set_frozen(position, tile_type)
+        if len(positions) == 0:
+            return
+
+        pos = np.asarray(positions, dtype=np.intp)
+        if pos.ndim == 1:
+            pos = pos.reshape(1, -1)
+        if pos.shape[1] != len(self._dimensions):
+            raise ValueError(f"Positions do not match dimensions {self._dimensions}")
+
+        # Validate all bounds in one pass
+        dims = np.asarray(self._dimensions)
+        if (pos < 0).any() or (pos >= dims).any():
+            raise ValueError(f"Positions out of bounds for dimensions {self._dimensions}")
+
+        # Validate the value once, it is the same for every position
+        if self._contains is not None and not self._contains(tile_type):
+            raise ValueError(f"Value {tile_type} is not valid for this space")
+
+        index = tuple(pos[:, d] for d in range(pos.shape[1]))
+        self._frozen_mask[index] = True
+        self._frozen_values[index] = tile_type
+        self._frozen_flat_cache = None
     
     def freeze_all_tiles_of_types(self, content, tile_types):
         """
         Freeze all tiles of specified types in the given content.
-        
+        This is an alias for freeze_tiles_by_value which shares the same
+        vectorized core.
+
         Parameters:
             content(np.ndarray): the content array to analyze
             tile_types(list): list of tile type values to freeze
         """
-        content_array = np.array(content)
-        if content_array.shape != self._dimensions:
-            raise ValueError(f"Content shape {content_array.shape} does not match space dimensions {self._dimensions}")
-        
-        # Find all positions that match target tile types
-        for tile_type in tile_types:
-            positions = np.where(content_array == tile_type)
-            for i in range(len(positions[0])):
-                coord_tuple = tuple(positions[j][i] for j in range(len(positions)))
-                self.set_frozen(coord_tuple, tile_type)
\ No newline at end of file
+        self.freeze_tiles_by_value(content, tile_types)
+"""
+Specialization of FrozenArraySpace for the dominant shape: a 2D grid whose
+tiles come from an integer space. Construction of FrozenArraySpace picks this
+subclass automatically; callers keep seeing the FrozenArraySpace interface.
+"""
+class _FrozenArraySpace2DInt(FrozenArraySpace):
+    def __init__(self, dimensions, value, frozen_mask=None):
+        super().__init__(dimensions, value, frozen_mask)
+        self._height, self._width = self._dimensions
+
+    def _set_frozen_fast(self, coordinates, value):
+        """
+        Scalar-unrolled 2D variant of the freeze write, skipping the generic
+        per-dimension validation loop.
+
+        Parameters:
+            coordinates(tuple): (y, x) coordinates of the tile to freeze
+            value(any): the value to freeze the tile at
+        """
+        if len(coordinates) != 2:
+            raise ValueError(f"Coordinates {coordinates} do not match dimensions {self._dimensions}")
+        y, x = coordinates
+        if not (0 <= y < self._height):
+            raise ValueError(f"Coordinate {y} out of bounds for dimension 0 (size {self._height})")
+        if not (0 <= x < self._width):
+            raise ValueError(f"Coordinate {x} out of bounds for dimension 1 (size {self._width})")
+
+        if self._contains is not None and not self._contains(value):
+            raise ValueError(f"Value {value} is not valid for this space")
+
+        self._frozen_mask[y, x] = True
+        self._frozen_values[y, x] = value
+        self._frozen_flat_cache = None
+
+    def _is_frozen_fast(self, coordinates):
+        """
+        Scalar-unrolled 2D variant of the frozen check.
+
+        Parameters:
+            coordinates(tuple): (y, x) coordinates to check
+
+        Returns:
+            bool: True if the tile is frozen, False otherwise
+        """
+        if len(coordinates) != 2:
+            return False
+        y, x = coordinates
+        if 0 <= y < self._height and 0 <= x < self._width:
+            return bool(self._frozen_mask[y, x])
+        return False
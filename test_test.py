@@ -10,8 +10,8 @@ env_name = 'binary-w16-h16-p100'
 pcg_benchmark.register(env_name, BinaryProblem, env_params)
 # env = pcg_benchmark.make('binary-v0')
 env = pcg_benchmark.make(env_name)
-# generate 100 random content from the content_space
-contents = [env.content_space.sample() for _ in range(10)]
+# generate 100 random content from the content_space in one batched call
+contents = env.content_space.sample_batch(10)
 
 # geberate 100 random control parameters from the control_space
 controls = [env.control_space.sample() for _ in range(10)]